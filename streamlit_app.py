@@ -2,10 +2,15 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import os
+import re
+import html
+import csv
+import glob
+import hashlib
 from datetime import datetime
+from scipy import sparse
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-import pickle
+import joblib
 
 # Page config
 st.set_page_config(
@@ -15,398 +20,15 @@ st.set_page_config(
 )
 
 # Custom CSS - Clean professional design with fixed coloring
-st.markdown("""
-<style>
-    /* SOLID COLORS ONLY - NO GRADIENTS! */
-    :root {
-        --dark-olive: #4E5D46;
-        --blue: #4E91B3;
-        --warm-brown: #8D716D;
-        --coral: #D98B73;
-        --orange: #FDA767;
-    }
-    
-    /* Clean main app */
-    .stApp {
-        background-color: #ffffff;
-        font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-    }
-    
-    /* SOLID BLUE header - NO GRADIENT */
-    .main-header {
-        background-color: var(--blue);
-        color: white;
-        padding: 2.5rem;
-        border-radius: 15px;
-        text-align: center;
-        margin-bottom: 2rem;
-        box-shadow: 0 4px 15px rgba(78, 145, 179, 0.2);
-    }
-    
-    /* SOLID WHITE event cards with coral border */
-    .event-card {
-        background-color: white;
-        border-radius: 15px;
-        padding: 1.5rem;
-        margin-bottom: 1.5rem;
-        border: 1px solid #e9ecef;
-        border-left: 5px solid var(--coral);
-        box-shadow: 0 2px 10px rgba(0,0,0,0.05);
-    }
-    
-    /* RECOMMENDATION CARDS - Special styling */
-    .recommendation-card {
-        background-color: #f8f9fa;
-        border-radius: 15px;
-        padding: 1.5rem;
-        margin-bottom: 1.5rem;
-        border: 2px solid var(--orange);
-        box-shadow: 0 4px 15px rgba(253, 167, 103, 0.2);
-    }
-    
-    .event-title {
-        color: var(--dark-olive);
-        font-size: 1.3rem;
-        font-weight: 600;
-        margin-bottom: 0.5rem;
-    }
-    
-    .event-org {
-        color: var(--blue);
-        font-weight: 500;
-        margin-bottom: 0.3rem;
-    }
-    
-    .event-location {
-        color: var(--warm-brown);
-        font-weight: 500;
-        margin-bottom: 0.8rem;
-    }
-    
-    /* SOLID CORAL tags - NO GRADIENT */
-    .tag {
-        background-color: var(--coral);
-        color: white;
-        padding: 0.3rem 0.8rem;
-        border-radius: 15px;
-        font-size: 0.8rem;
-        font-weight: 600;
-        margin-right: 0.5rem;
-        margin-bottom: 0.3rem;
-        display: inline-block;
-    }
-    
-    /* SIMILARITY SCORE tag */
-    .similarity-tag {
-        background-color: var(--orange);
-        color: white;
-        padding: 0.3rem 0.8rem;
-        border-radius: 15px;
-        font-size: 0.9rem;
-        font-weight: 700;
-        margin-right: 0.5rem;
-        margin-bottom: 0.3rem;
-        display: inline-block;
-    }
-    
-    /* WHITE inputs with warm brown border - MAIN AREA */
-    .stTextInput > div > div > input {
-        background-color: white !important;
-        color: #212529 !important;
-        border: 2px solid var(--warm-brown) !important;
-        border-radius: 10px !important;
-        font-weight: 500 !important;
-    }
-    
-    /* MAIN AREA DROPDOWNS - WHITE BACKGROUND */
-    .stSelectbox > div > div {
-        background-color: white !important;
-        border: 2px solid var(--warm-brown) !important;
-        border-radius: 10px !important;
-    }
-    
-    .stSelectbox > div > div > div {
-        background-color: white !important;
-        color: #212529 !important;
-    }
-    
-    /* Force dropdown text to be dark and readable */
-    .stSelectbox div[role="combobox"] {
-        background-color: white !important;
-        color: #212529 !important;
-    }
-    
-    .stSelectbox div[role="combobox"] > div {
-        color: #212529 !important;
-    }
-    
-    .stSelectbox div[role="combobox"] span {
-        color: #212529 !important;
-    }
-    
-    /* Dropdown menu items */
-    div[data-baseweb="select"] > div {
-        background-color: white !important;
-        color: #212529 !important;
-    }
-    
-    div[data-baseweb="popover"] {
-        background-color: white !important;
-    }
-    
-    ul[data-baseweb="menu"] {
-        background-color: white !important;
-    }
-    
-    ul[data-baseweb="menu"] li {
-        background-color: white !important;
-        color: #212529 !important;
-    }
-    
-    ul[data-baseweb="menu"] li:hover {
-        background-color: #f8f9fa !important;
-        color: #212529 !important;
-    }
-    
-    /* NUCLEAR OPTION FOR ALL DROPDOWNS - FORCE WHITE BACKGROUND AND DARK TEXT */
-    .stSelectbox *,
-    .stMultiSelect *,
-    div[data-baseweb="select"] *,
-    div[data-baseweb="popover"] *,
-    ul[data-baseweb="menu"] *,
-    div[role="combobox"] *,
-    div[role="listbox"] *,
-    div[role="option"] * {
-        background-color: white !important;
-        color: #212529 !important;
-    }
-    
-    /* Target the specific multiselect container */
-    .stMultiSelect > div {
-        background-color: white !important;
-    }
-    
-    .stMultiSelect > div > div {
-        background-color: white !important;
-        border: 2px solid var(--warm-brown) !important;
-        border-radius: 10px !important;
-    }
-    
-    .stMultiSelect > div > div > div {
-        background-color: white !important;
-        color: #212529 !important;
-    }
-    
-    /* Force all text inside multiselect to be dark */
-    .stMultiSelect span {
-        color: #212529 !important;
-    }
-    
-    .stMultiSelect div {
-        color: #212529 !important;
-    }
-    
-    /* Target the placeholder and selected text */
-    .stMultiSelect div[data-baseweb="select"] span {
-        color: #212529 !important;
-    }
-    
-    .stMultiSelect div[data-baseweb="select"] div {
-        color: #212529 !important;
-    }
-    
-    /* Override any inherited dark styling */
-    [data-testid="stMultiSelect"] * {
-        color: #212529 !important;
-        background-color: white !important;
-    }
-    
-    [data-testid="stSelectbox"] * {
-        color: #212529 !important;
-        background-color: white !important;
-    }
-    
-    /* Force dropdown items to be readable */
-    li[role="option"] {
-        background-color: white !important;
-        color: #212529 !important;
-    }
-    
-    li[role="option"]:hover {
-        background-color: #f8f9fa !important;
-        color: #212529 !important;
-    }
-    
-    /* SOLID ORANGE buttons - NO GRADIENT */
-    .stButton > button {
-        background-color: var(--orange) !important;
-        color: white !important;
-        border: none !important;
-        border-radius: 10px !important;
-        padding: 0.7rem 1.5rem !important;
-        font-weight: 600 !important;
-    }
-    
-    .stButton > button:hover {
-        background-color: var(--coral) !important;
-    }
-    
-    /* SOLID BLUE primary button */
-    div[data-testid="stButton"] button[kind="primary"] {
-        background-color: var(--blue) !important;
-    }
-    
-    div[data-testid="stButton"] button[kind="primary"]:hover {
-        background-color: var(--dark-olive) !important;
-    }
-    
-    /* RECOMMENDATION button styling */
-    .recommend-button {
-        background-color: var(--orange) !important;
-        border: 2px solid var(--coral) !important;
-    }
-    
-    /* DARK OLIVE SIDEBAR - COMPLETE OVERRIDE */
-    section[data-testid="stSidebar"] {
-        background-color: var(--dark-olive) !important;
-    }
-    
-    section[data-testid="stSidebar"] > div {
-        background-color: var(--dark-olive) !important;
-    }
-    
-    /* Force ALL sidebar content to be white text */
-    section[data-testid="stSidebar"] * {
-        color: white !important;
-    }
-    
-    section[data-testid="stSidebar"] .stMarkdown {
-        color: white !important;
-    }
-    
-    section[data-testid="stSidebar"] .stMarkdown * {
-        color: white !important;
-    }
-    
-    section[data-testid="stSidebar"] .stMarkdown p {
-        color: white !important;
-    }
-    
-    section[data-testid="stSidebar"] .stMarkdown h1,
-    section[data-testid="stSidebar"] .stMarkdown h2,
-    section[data-testid="stSidebar"] .stMarkdown h3,
-    section[data-testid="stSidebar"] .stMarkdown h4 {
-        color: white !important;
-    }
-    
-    section[data-testid="stSidebar"] label {
-        color: white !important;
-        font-weight: 600 !important;
-    }
-    
-    /* SIDEBAR METRICS - WHITE BACKGROUND WITH CORAL BORDER */
-    section[data-testid="stSidebar"] div[data-testid="metric-container"] {
-        background-color: white !important;
-        border: 2px solid var(--coral) !important;
-        border-radius: 12px !important;
-        padding: 1.2rem !important;
-        margin-bottom: 1rem !important;
-    }
-    
-    section[data-testid="stSidebar"] div[data-testid="metric-container"] label {
-        color: var(--dark-olive) !important;
-        font-weight: 600 !important;
-    }
-    
-    section[data-testid="stSidebar"] div[data-testid="metric-container"] [data-testid="metric-value"] {
-        color: var(--dark-olive) !important;
-        font-weight: 700 !important;
-        font-size: 1.8rem !important;
-    }
-    
-    /* ORANGE rating display */
-    .rating-display {
-        color: var(--orange);
-        font-size: 1.2rem;
-        font-weight: bold;
-    }
-    
-    /* Similarity score display */
-    .similarity-score {
-        color: var(--blue);
-        font-size: 1.1rem;
-        font-weight: bold;
-        background-color: #e3f2fd;
-        padding: 0.5rem 1rem;
-        border-radius: 10px;
-        display: inline-block;
-        margin-bottom: 1rem;
-    }
-    
-    /* Hide Streamlit elements */
-    #MainMenu {visibility: hidden;}
-    footer {visibility: hidden;}
-    header {visibility: hidden;}
-    
-    /* Main content text - DARK TEXT ON WHITE */
-    .stMarkdown, .stText, p, div {
-        color: #212529;
-    }
-    
-    label {
-        color: #495057;
-        font-weight: 600;
-    }
-    
-    /* Tabs styling */
-    .stTabs [data-baseweb="tab-list"] {
-        gap: 24px;
-    }
-    
-    .stTabs [data-baseweb="tab"] {
-        height: 50px;
-        background-color: white;
-        border-radius: 10px;
-        border: 2px solid var(--coral);
-        color: var(--dark-olive);
-        font-weight: 600;
-    }
-    
-    .stTabs [aria-selected="true"] {
-        background-color: var(--coral) !important;
-        color: white !important;
-    }
-    
-    /* Success/Info/Error messages */
-    .stSuccess {
-        background-color: #d4edda;
-        color: #155724;
-        border: 1px solid #c3e6cb;
-        border-radius: 10px;
-    }
-    
-    .stInfo {
-        background-color: #d1ecf1;
-        color: #0c5460;
-        border: 1px solid #bee5eb;
-        border-radius: 10px;
-    }
-    
-    .stError {
-        background-color: #f8d7da;
-        color: #721c24;
-        border: 1px solid #f5c6cb;
-        border-radius: 10px;
-    }
-    
-    .stWarning {
-        background-color: #fff3cd;
-        color: #856404;
-        border: 1px solid #ffeaa7;
-        border-radius: 10px;
-    }
-</style>
-""", unsafe_allow_html=True)
+STYLES_CSS = "assets/styles.css"
+
+@st.cache_data
+def load_css(path):
+    """Stylesheet contents, read from disk once per process"""
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+st.markdown(f"<style>\n{load_css(STYLES_CSS)}</style>", unsafe_allow_html=True)
 
 # Beautiful header
 st.markdown("""
@@ -418,50 +40,101 @@ st.markdown("""
 
 # === COSINE SIMILARITY RECOMMENDER SYSTEM ===
 
-# File paths for caching
-SIMILARITY_MATRIX_FILE = "similarity_matrix.pkl"
-TFIDF_VECTORIZER_FILE = "tfidf_vectorizer.pkl"
+# File paths for caching - filled in with a hash of the features and params they were fitted on
+TFIDF_VECTORIZER_FILE = "tfidf_vectorizer_{}.joblib"
+TFIDF_MATRIX_FILE = "tfidf_matrix_{}.npz"
 
-@st.cache_data
-def load_volunteer_data():
+TFIDF_PARAMS = dict(
+    max_features=5000,
+    stop_words='english',
+    lowercase=True,
+    ngram_range=(1, 1),
+    min_df=2,  # Terms seen in a single event can't make two events similar
+    sublinear_tf=True,  # Dampen repeated terms in long descriptions
+    dtype=np.float32  # Half the bytes per sparse product; plenty of precision for ranking
+)
+
+# Source data
+ENRICHED_CSV = "Merged_Enriched_Events_CLUSTERED.csv"
+HISTORICAL_CSV = "NYC_Service__Volunteer_Opportunities__Historical__20250626.csv"
+
+# Enriched-CSV columns the app reads; the rest of the file is never parsed
+ENRICHED_COLUMNS = {
+    'opportunity_id', 'title', 'description', 'org_title', 'Topical Theme', 'Mood/Intent',
+    'Effort Estimate', 'Weather Badge', 'locality', 'region', 'Borough',
+}
+
+def clean_columns(df):
+    """Fill missing text with "" and downcast numeric columns, leaving them numeric"""
+    text_cols = df.select_dtypes(include=["object", "string"]).columns
+    df[text_cols] = df[text_cols].fillna("")
+    for col in df.select_dtypes(include="integer").columns:
+        df[col] = pd.to_numeric(df[col], downcast="integer")
+    for col in df.select_dtypes(include="floating").columns:
+        df[col] = pd.to_numeric(df[col], downcast="float")
+    return df
+
+@st.cache_data(show_spinner="🌱 Loading volunteer opportunities...", ttl=3600)
+def load_volunteer_data(enriched_path, historical_path):
     """Load and MERGE both of YOUR CSV files for complete data - NO SAMPLE DATA"""
     
     # Load BOTH your CSV files - REQUIRED FILES
     try:
-        enriched_df = pd.read_csv("Merged_Enriched_Events_CLUSTERED.csv")
+        enriched_df = pd.read_csv(enriched_path, usecols=lambda col: col in ENRICHED_COLUMNS)
         # st.success(f"✅ Loaded enriched data: {len(enriched_df)} events")  # Commented out
     except FileNotFoundError:
-        st.error("❌ Could not find 'Merged_Enriched_Events_CLUSTERED.csv' - This file is required!")
+        st.error(f"❌ Could not find '{enriched_path}' - This file is required!")
         st.stop()
     
     try:
-        historical_df = pd.read_csv("NYC_Service__Volunteer_Opportunities__Historical__20250626.csv")
+        # Only the location columns are merged in - skip parsing the rest of the file
+        historical_df = pd.read_csv(
+            historical_path,
+            usecols=['opportunity_id', 'locality', 'region', 'Borough'],
+            dtype={'locality': str, 'region': str, 'Borough': str},
+        )
         # st.success(f"✅ Loaded historical data for location info")  # Commented out
     except FileNotFoundError:
         # st.warning("⚠️ Historical location data not found - using enriched data only")  # Commented out
         historical_df = None
     
     # Clean both datasets
-    enriched_df = enriched_df.fillna("")
+    enriched_df = clean_columns(enriched_df)
     
     if historical_df is not None:
-        historical_df = historical_df.fillna("")
+        historical_df = clean_columns(historical_df)
         
         # Merge them on opportunity_id to get BOTH the enriched data AND the location data
         merged_df = enriched_df.merge(
-            historical_df[['opportunity_id', 'locality', 'region', 'Borough', 'Latitude', 'Longitude']], 
+            historical_df, 
             on='opportunity_id', 
-            how='left'
+            how='left',
+            suffixes=('', '_historical')
         )
+        # Enriched location values win; historical ones only fill the gaps (no _x/_y columns)
+        for col in ['locality', 'region', 'Borough']:
+            if f'{col}_historical' in merged_df.columns:
+                historical = merged_df.pop(f'{col}_historical')
+                merged_df[col] = merged_df[col].replace('', np.nan).combine_first(historical).fillna('')
         # st.info(f"📍 Merged location data for {len(merged_df)} events")  # Commented out
     else:
         merged_df = enriched_df.copy()
     
-    # Create proper location field using the REAL location data
-    merged_df['location_display'] = merged_df.apply(lambda row: 
-        f"{row.get('locality', '')}, {row.get('region', '')}" if row.get('locality') 
-        else f"{row.get('Borough', '')}, NY" if row.get('Borough')
-        else "New York, NY", axis=1
+    # Create proper location field using the REAL location data. locality is a full
+    # address - "street\nCity, NY zip\n(lat, lon)" - so drop the coordinates line and
+    # put the rest on one line; it already ends in the state, so region isn't appended
+    missing = pd.Series('', index=merged_df.index)
+    locality = (
+        merged_df.get('locality', missing).fillna('').astype(str)
+        .str.replace(r'\s*\(\s*-?[\d.]+\s*,\s*-?[\d.]+\s*\)\s*$', '', regex=True)
+        .str.replace(r'\s*\n\s*', ', ', regex=True)
+        .str.strip()
+    )
+    borough = merged_df.get('Borough', missing).fillna('').astype(str).str.strip()
+    merged_df['location_display'] = np.select(
+        [locality.ne(''), borough.ne('')],
+        [locality, borough + ', NY'],
+        default='New York, NY'
     )
     
     # Convert key columns to strings for similarity calculation
@@ -471,93 +144,156 @@ def load_volunteer_data():
             merged_df[col] = merged_df[col].astype(str)
     
     # Create combined features for similarity calculation
-    merged_df['combined_features'] = (
-        merged_df.get('title', '') + ' ' + 
-        merged_df.get('description', '') + ' ' + 
-        merged_df.get('Topical Theme', '') + ' ' + 
-        merged_df.get('Mood/Intent', '') + ' ' + 
-        merged_df.get('org_title', '') + ' ' +
-        merged_df.get('location_display', '')
-    )
+    feature_columns = [col for col in ['title', 'description', 'Topical Theme', 'Mood/Intent', 'org_title', 'location_display']
+                       if col in merged_df.columns]
+    merged_df['combined_features'] = merged_df[feature_columns[0]].str.cat(merged_df[feature_columns[1:]], sep=' ')
+    
+    # Lowercased haystack for keyword search, built once instead of on every query;
+    # fields are newline-joined so a single-line query never matches across two of them
+    search_columns = [col for col in ['title', 'description', 'Topical Theme', 'Mood/Intent'] if col in merged_df.columns]
+    merged_df['_search_blob'] = merged_df[search_columns[0]].str.cat(merged_df[search_columns[1:]], sep='\n').str.lower()
     
     # Create event IDs for ratings
     merged_df['event_id'] = merged_df['opportunity_id'].astype(str) + "_" + merged_df['title'].str[:10]
+
+    # Tag pills for the event cards, built once per load instead of per render
+    tags_html = pd.Series('', index=merged_df.index)
+    for col, prefix in [('Topical Theme', '🎯 '), ('Mood/Intent', '💭 '), ('Effort Estimate', ''), ('Weather Badge', '')]:
+        if col in merged_df.columns:
+            values = merged_df[col].astype(str)
+            has_value = values.ne('') & values.ne('nan')
+            tags_html += np.where(has_value, f'<span class="tag">{prefix}' + values + '</span>', '')
+    merged_df['_tags_html'] = tags_html
+
+    # Low-cardinality labels as categoricals - after the string concatenation above
+    for col in ['Topical Theme', 'Mood/Intent', 'location_display']:
+        if col in merged_df.columns:
+            merged_df[col] = merged_df[col].astype('category')
+    
+    # Keep only the columns the app reads - this frame is pickled on every cache hit
+    keep_columns = ['opportunity_id', 'event_id', 'title', 'description', 'org_title', 'Topical Theme',
+                    'Mood/Intent', 'location_display', 'combined_features', '_search_blob', '_tags_html']
+    merged_df = merged_df[[col for col in keep_columns if col in merged_df.columns]]
     
-    # Create short description
-    merged_df['short_description'] = merged_df['description'].str[:150] + "..."
+    # Stamp this load so cached helpers can key on it instead of hashing every cell
+    merged_df.attrs['loaded_at'] = datetime.utcnow().isoformat()
     
     # Show data summary
     # st.success(f"🎯 Ready to recommend from {len(merged_df)} volunteer opportunities!")  # Commented out
     
     return merged_df
 
-def create_similarity_matrix(df):
-    """Create cosine similarity matrix for all events"""
+def hash_loaded_frame(frame):
+    """Cache key for the frame returned by load_volunteer_data - O(1) instead of a content hash.
+
+    st.cache_data hands out a fresh copy of the loaded frame on every rerun, so id()
+    would never hit; the load stamp survives the copy. Shape guards against slices,
+    which inherit attrs.
+    """
+    return frame.attrs.get('loaded_at'), frame.shape
+
+LOADED_FRAME_HASH_FUNCS = {pd.DataFrame: hash_loaded_frame}
+
+@st.cache_data(hash_funcs=LOADED_FRAME_HASH_FUNCS)
+def get_filter_options(df):
+    """Non-empty theme and mood values, in order of first appearance"""
+    themes = [theme for theme in df['Topical Theme'].dropna().unique() if theme and str(theme) != 'nan']
+    moods = [mood for mood in df['Mood/Intent'].dropna().unique() if mood and str(mood) != 'nan']
+    return themes, moods
+
+@st.cache_data(hash_funcs=LOADED_FRAME_HASH_FUNCS)
+def compute_sidebar_stats(df):
+    """Summary counts for the sidebar and get-started buttons, computed once per dataset"""
+    return {
+        "top_themes": df['Topical Theme'].value_counts().head(6),
+    }
+
+@st.cache_resource(show_spinner=False, max_entries=1, hash_funcs=LOADED_FRAME_HASH_FUNCS)
+def create_tfidf_matrix(df):
+    """Fit TF-IDF on all events; similarities are computed from its rows on demand.
+
+    Held in-process per loaded dataset, so reruns skip the joblib/npz reads. The files on
+    disk are named after the features and params they were fitted on, so any change to
+    either fits fresh ones instead of reusing stale artifacts.
+    """
+    fingerprint = hashlib.sha1(pd.util.hash_pandas_object(df['combined_features'], index=False).to_numpy())
+    fingerprint.update(repr(sorted(TFIDF_PARAMS.items())).encode())
+    version = fingerprint.hexdigest()[:16]
+    vectorizer_file = TFIDF_VECTORIZER_FILE.format(version)
+    matrix_file = TFIDF_MATRIX_FILE.format(version)
+    
     try:
-        # Load cached similarity matrix if exists
-        if os.path.exists(SIMILARITY_MATRIX_FILE) and os.path.exists(TFIDF_VECTORIZER_FILE):
-            with open(SIMILARITY_MATRIX_FILE, 'rb') as f:
-                similarity_matrix = pickle.load(f)
-            with open(TFIDF_VECTORIZER_FILE, 'rb') as f:
-                tfidf_vectorizer = pickle.load(f)
-            # st.success("✅ Loaded cached similarity matrix")  # Commented out
-            return similarity_matrix, tfidf_vectorizer
+        # Load cached TF-IDF matrix if exists
+        if os.path.exists(vectorizer_file) and os.path.exists(matrix_file):
+            tfidf_vectorizer = joblib.load(vectorizer_file)
+            tfidf_matrix = sparse.load_npz(matrix_file)
+            # A matrix fitted on other rows would index past the end of this frame - refit instead
+            if tfidf_matrix.shape[0] == len(df):
+                # st.success("✅ Loaded cached TF-IDF matrix")  # Commented out
+                return tfidf_vectorizer, tfidf_matrix
     except Exception as e:
-        st.warning(f"Could not load cached similarity matrix: {e}")
+        st.warning(f"Could not load cached TF-IDF matrix: {e}")
     
-    # Create new similarity matrix
-    with st.spinner("🔄 Computing cosine similarity matrix for all events..."):
+    # Create new TF-IDF matrix
+    with st.spinner("🔄 Vectorizing all events..."):
         # Create TF-IDF vectorizer
-        tfidf_vectorizer = TfidfVectorizer(
-            max_features=5000,
-            stop_words='english',
-            lowercase=True,
-            ngram_range=(1, 2)  # Include bigrams for better context
-        )
+        tfidf_vectorizer = TfidfVectorizer(**TFIDF_PARAMS)
         
-        # Fit and transform the combined features
+        # Fit and transform the combined features. Rows come out L2-normalized, so the
+        # cosine similarity of two events is just the dot product of their sparse rows.
         tfidf_matrix = tfidf_vectorizer.fit_transform(df['combined_features'])
         
-        # Calculate cosine similarity matrix
-        similarity_matrix = cosine_similarity(tfidf_matrix)
-        
         # Cache the results
         try:
-            with open(SIMILARITY_MATRIX_FILE, 'wb') as f:
-                pickle.dump(similarity_matrix, f)
-            with open(TFIDF_VECTORIZER_FILE, 'wb') as f:
-                pickle.dump(tfidf_vectorizer, f)
-            # st.success("✅ Similarity matrix computed and cached!")  # Commented out
+            joblib.dump(tfidf_vectorizer, vectorizer_file, compress=3)
+            sparse.save_npz(matrix_file, tfidf_matrix)
+            # Only the artifacts for the current features are ever read again
+            for pattern, current in [(TFIDF_VECTORIZER_FILE, vectorizer_file), (TFIDF_MATRIX_FILE, matrix_file)]:
+                for stale_file in glob.glob(pattern.format('*')):
+                    if stale_file != current:
+                        os.remove(stale_file)
+            # st.success("✅ TF-IDF matrix computed and cached!")  # Commented out
         except Exception as e:
-            st.warning(f"Could not cache similarity matrix: {e}")
+            st.warning(f"Could not cache TF-IDF matrix: {e}")
     
-    return similarity_matrix, tfidf_vectorizer
+    return tfidf_vectorizer, tfidf_matrix
+
+def top_k_indices(scores, k, exclude=None):
+    """Positions of the k highest scores, best first, without sorting every score"""
+    scores = np.asarray(scores)
+    if exclude is not None:
+        scores = scores.copy()
+        scores[exclude] = -np.inf
+    k = min(k, len(scores) - (exclude is not None))
+    if k <= 0:
+        return np.array([], dtype=np.intp)
+    
+    # O(N) selection of the k-th best score, then sort just the winners
+    # (ties at the cut-off are taken in row order, like a stable full sort)
+    kth_score = -np.partition(-scores, k - 1)[k - 1]
+    top = np.flatnonzero(scores > kth_score)
+    ties = np.flatnonzero(scores == kth_score)[:k - len(top)]
+    top = np.concatenate([top, ties])
+    return top[np.argsort(-scores[top], kind='stable')]
 
-def get_event_recommendations(event_index, similarity_matrix, df, num_recommendations=5):
+def get_event_recommendations(event_index, tfidf_matrix, df, num_recommendations=5):
     """Get similar events using cosine similarity"""
-    if event_index >= len(similarity_matrix):
+    if event_index >= tfidf_matrix.shape[0]:
         return pd.DataFrame()
     
-    # Get similarity scores for this event
-    sim_scores = list(enumerate(similarity_matrix[event_index]))
-    
-    # Sort by similarity score (excluding the event itself)
-    sim_scores = sorted(sim_scores, key=lambda x: x[1], reverse=True)[1:]
+    # Similarity of this event to every event - one sparse row product, no NxN matrix
+    sim_scores = (tfidf_matrix @ tfidf_matrix[event_index].T).toarray().ravel()
     
-    # Get top N similar events
-    top_similar = sim_scores[:num_recommendations]
-    
-    # Get event indices and similarity scores
-    event_indices = [i[0] for i in top_similar]
-    similarity_scores = [i[1] for i in top_similar]
+    # Top N similar events, excluding the event itself
+    event_indices = top_k_indices(sim_scores, num_recommendations, exclude=event_index)
     
     # Return similar events with similarity scores
     similar_events = df.iloc[event_indices].copy()
-    similar_events['similarity_score'] = similarity_scores
+    similar_events['similarity_score'] = sim_scores[event_indices]
     
     return similar_events
 
-def get_recommendations_by_preferences(user_themes, user_moods, df, tfidf_vectorizer, num_recommendations=8):
+def get_recommendations_by_preferences(user_themes, user_moods, df, tfidf_vectorizer, tfidf_matrix, num_recommendations=8):
     """Get recommendations based on user's preferred themes and moods"""
     # Create a synthetic user profile
     user_profile = " ".join(user_themes + user_moods)
@@ -565,66 +301,134 @@ def get_recommendations_by_preferences(user_themes, user_moods, df, tfidf_vector
     # Transform user profile using the same vectorizer
     user_tfidf = tfidf_vectorizer.transform([user_profile])
     
-    # Calculate similarity between user profile and all events
-    user_similarity = cosine_similarity(user_tfidf, tfidf_vectorizer.transform(df['combined_features']))[0]
-    
-    # Get top recommendations
-    sim_scores = list(enumerate(user_similarity))
-    sim_scores = sorted(sim_scores, key=lambda x: x[1], reverse=True)
+    # Calculate similarity between user profile and all events (reusing the fitted event matrix);
+    # both sides are L2-normalized by the vectorizer, so cosine is a single sparse mat-vec
+    user_similarity = (tfidf_matrix @ user_tfidf.T).toarray().ravel()
     
     # Get top N events
-    top_events = sim_scores[:num_recommendations]
-    event_indices = [i[0] for i in top_events]
-    similarity_scores = [i[1] for i in top_events]
+    event_indices = top_k_indices(user_similarity, num_recommendations)
     
     recommended_events = df.iloc[event_indices].copy()
-    recommended_events['similarity_score'] = similarity_scores
+    recommended_events['similarity_score'] = user_similarity[event_indices]
     
     return recommended_events
 
+# Bounded: every distinct query typed is a new entry
+@st.cache_data(show_spinner=False, max_entries=256, hash_funcs=LOADED_FRAME_HASH_FUNCS)
+def search_events(df, query_lower):
+    """Row positions of events matching the query, falling back to any single word"""
+    search_blob = df['_search_blob']
+    text_mask = search_blob.str.contains(query_lower, regex=False, na=False).to_numpy()
+    
+    if not text_mask.any():
+        # Fallback search - match any single word, as one alternation over the blob
+        words = query_lower.split()
+        if words:
+            pattern = '|'.join(map(re.escape, words))
+            text_mask = search_blob.str.contains(pattern, regex=True, na=False).to_numpy()
+    
+    return np.flatnonzero(text_mask)
+
 # === Community Rating System ===
 FEEDBACK_CSV = "feedback_backup.csv"
+FEEDBACK_COLUMNS = ["event_id", "rating", "comment", "timestamp"]
 
 def ensure_feedback_csv():
     if not os.path.exists(FEEDBACK_CSV):
-        pd.DataFrame(columns=["event_id", "rating", "comment", "timestamp"]).to_csv(FEEDBACK_CSV, index=False)
+        pd.DataFrame(columns=FEEDBACK_COLUMNS).to_csv(FEEDBACK_CSV, index=False, lineterminator='\n')
 
 def load_feedback():
     if os.path.exists(FEEDBACK_CSV):
-        return pd.read_csv(FEEDBACK_CSV)
-    return pd.DataFrame(columns=["event_id", "rating", "comment", "timestamp"])
+        return pd.read_csv(FEEDBACK_CSV, dtype={"comment": str})
+    return pd.DataFrame(columns=FEEDBACK_COLUMNS)
 
 def store_feedback(event_id, rating, comment):
-    df = load_feedback()
     timestamp = datetime.utcnow().isoformat()
-    idx = df[df.event_id == event_id].index
-    if len(idx):
+    if event_id in load_event_ratings(feedback_version()):
+        # Re-rating an event updates its row in place, which needs a full rewrite
+        df = load_feedback()
+        idx = df[df.event_id == event_id].index
         df.loc[idx, ["rating", "comment", "timestamp"]] = [rating, comment, timestamp]
+        df.to_csv(FEEDBACK_CSV, index=False, lineterminator='\n')
     else:
-        new_row = pd.DataFrame([{"event_id": event_id, "rating": rating, "comment": comment, "timestamp": timestamp}])
-        df = pd.concat([df, new_row], ignore_index=True)
-    df.to_csv(FEEDBACK_CSV, index=False)
+        # First rating for an event - append one line instead of rewriting the file
+        with open(FEEDBACK_CSV, 'a', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f, lineterminator='\n')  # Matches the header and rewrites on every OS
+            if f.tell() == 0:
+                writer.writerow(FEEDBACK_COLUMNS)
+            writer.writerow([event_id, rating, comment, timestamp])
+    load_event_ratings.clear()
 
-def get_event_rating(event_id):
+def feedback_version():
+    """Modification time of the feedback file - changes whenever a rating is written"""
+    return os.path.getmtime(FEEDBACK_CSV) if os.path.exists(FEEDBACK_CSV) else None
+
+@st.cache_data(max_entries=1)
+def load_event_ratings(version):
+    """(average rating, star string) per event_id, from a single groupby over the feedback file.
+
+    Keyed on feedback_version(), so the CSV is only re-parsed after it changes.
+    """
     df = load_feedback()
-    ratings = df[df.event_id == event_id]["rating"]
-    return round(ratings.mean(), 2) if not ratings.empty else None
+    averages = df.groupby("event_id")["rating"].mean().round(2).dropna()
+    return {event_id: (avg, "⭐" * int(avg)) for event_id, avg in averages.items()}
 
 ensure_feedback_csv()
 
+def card_headers(events, card_class, icon):
+    """Title/org/location card HTML for every row of events, built column-wise"""
+    return (
+        f'<div class="{card_class}"><div class="event-title">{icon} ' + events['title'] +
+        '</div><div class="event-org">🏢 ' + events['org_title'] +
+        '</div><div class="event-location">📍 ' + events['location_display'].astype(str) + '</div></div>'
+    )
+
+def description_snippet(description):
+    """First 150 characters of a description as one HTML-safe line (a blank line would end the HTML block)"""
+    return html.escape(' '.join(description[:150].split())) + "..."
+
+@st.fragment
+def recommendation_card(event, header, key):
+    """One preference-based recommendation; its button reruns only this card, not the whole page"""
+    col1, col2 = st.columns([3, 1])
+    
+    with col1:
+        st.markdown(
+            f'{header}<div class="similarity-score">🎯 {event["similarity_score"]:.3f} match score</div>'
+            f'{event["_tags_html"]}<p>{description_snippet(event["description"])}</p>',
+            unsafe_allow_html=True
+        )
+    
+    with col2:
+        if st.button(f"I'm Interested!", key=key):
+            st.success("🎉 Great choice!")
+            # Add to user preferences
+            if event['Topical Theme']:
+                st.session_state.user_preferences['themes'].add(event['Topical Theme'])
+            if event['Mood/Intent']:
+                st.session_state.user_preferences['moods'].add(event['Mood/Intent'])
+
 # === MAIN APP ===
 
 # Load data and create similarity matrix
-df = load_volunteer_data()
-similarity_matrix, tfidf_vectorizer = create_similarity_matrix(df)
+df = load_volunteer_data(ENRICHED_CSV, HISTORICAL_CSV)
+tfidf_vectorizer, tfidf_matrix = create_tfidf_matrix(df)
+available_themes, available_moods = get_filter_options(df)
+sidebar_stats = compute_sidebar_stats(df)
 
 # Initialize session state
 if 'user_preferences' not in st.session_state:
-    st.session_state.user_preferences = {'themes': [], 'moods': []}
+    st.session_state.user_preferences = {'themes': set(), 'moods': set()}
 if 'show_recommendations' not in st.session_state:
     st.session_state.show_recommendations = False
 if 'recommended_for_event' not in st.session_state:
     st.session_state.recommended_for_event = None
+if 'quick_theme' not in st.session_state:
+    st.session_state.quick_theme = None
+
+def clear_quick_theme():
+    """A typed query replaces the active quick search"""
+    st.session_state.quick_theme = None
 
 # Main navigation
 tab1, tab2, tab3 = st.tabs(["🔍 Search Events", "🎯 Get Recommendations", "⭐ My Interests"])
@@ -638,113 +442,106 @@ with tab1:
     with col1:
         search_query = st.text_input(
             "What kind of volunteer work interests you?",
-            placeholder="e.g., help kids, environment, animals, food bank..."
+            placeholder="e.g., help kids, environment, animals, food bank...",
+            on_change=clear_quick_theme
         )
     
     with col2:
-        search_button = st.button("🚀 Search", type="primary", use_container_width=True)
+        search_button = st.button("🚀 Search", type="primary", use_container_width=True, on_click=clear_quick_theme)
     
     # Quick search buttons
     st.markdown("**Quick searches:**")
-    available_themes = [theme for theme in df['Topical Theme'].dropna().unique() if theme and str(theme) != 'nan']
     quick_searches = available_themes[:6] if len(available_themes) >= 6 else available_themes
     cols = st.columns(len(quick_searches))
     
     for i, topic in enumerate(quick_searches):
         with cols[i]:
             if st.button(topic, key=f"quick_{i}"):
-                search_query = topic.lower()
-                search_button = True
+                st.session_state.quick_theme = topic
+    
+    # Kept in session state so the quick-search results survive reruns from the card buttons
+    quick_theme = st.session_state.quick_theme
+    if quick_theme is not None:
+        search_query = quick_theme.lower()
+        search_button = True
     
     # Perform search
     if search_button or search_query:
-        if search_query:
-            query_lower = search_query.lower()
-            
-            # Search logic
-            text_mask = (
-                df['title'].str.lower().str.contains(query_lower, na=False) |
-                df['description'].str.lower().str.contains(query_lower, na=False) |
-                df.get('Topical Theme', pd.Series(dtype='str')).str.lower().str.contains(query_lower, na=False) |
-                df.get('Mood/Intent', pd.Series(dtype='str')).str.lower().str.contains(query_lower, na=False)
-            )
-            
-            results = df[text_mask]
+        # Whitespace-only input is no query at all - skip the scan rather than match every row
+        query_lower = search_query.strip().lower()
+        if query_lower:
             
-            if len(results) == 0:
-                # Fallback search
-                words = query_lower.split()
-                for word in words:
-                    word_mask = (
-                        df['title'].str.lower().str.contains(word, na=False) |
-                        df['description'].str.lower().str.contains(word, na=False)
-                    )
-                    word_results = df[word_mask]
-                    results = pd.concat([results, word_results]).drop_duplicates()
+            if quick_theme is not None:
+                # Quick searches are exact theme labels - compare categorical codes, no text scan
+                match_positions = np.flatnonzero(df['Topical Theme'] == quick_theme)
+            else:
+                # Search logic (cached per query, so unrelated reruns skip the scan)
+                match_positions = search_events(df, query_lower)
             
+            # Only materialize the rows that are actually rendered: full cards for the
+            # best matches, one table for the rest
+            results = df.iloc[match_positions[:3]]
+            more_results = df.iloc[match_positions[3:15]]
+
             # Display results
-            if len(results) > 0:
-                st.markdown(f"### 🎯 Found {len(results)} matching opportunities")
+            if len(match_positions) > 0:
+                st.markdown(f"### 🎯 Found {len(match_positions)} matching opportunities")
+                event_ratings = load_event_ratings(feedback_version())
                 
-                for idx, (_, event) in enumerate(results.head(10).iterrows()):
-                    # Event card
-                    st.markdown(f"""
-                    <div class="event-card">
-                        <div class="event-title">🌟 {event['title']}</div>
-                        <div class="event-org">🏢 {event['org_title']}</div>
-                        <div class="event-location">📍 {event['location_display']}</div>
-                    </div>
-                    """, unsafe_allow_html=True)
-                    
+                headers = card_headers(results, "event-card", "🌟")
+                for idx, (event, header) in enumerate(zip(results.to_dict('records'), headers)):
                     col1, col2 = st.columns([2, 1])
                     
                     with col1:
-                        # Tags
-                        if 'Topical Theme' in event and event['Topical Theme'] and str(event['Topical Theme']) != 'nan':
-                            st.markdown(f'<span class="tag">🎯 {event["Topical Theme"]}</span>', unsafe_allow_html=True)
-                        
-                        if 'Mood/Intent' in event and event['Mood/Intent'] and str(event['Mood/Intent']) != 'nan':
-                            st.markdown(f'<span class="tag">💭 {event["Mood/Intent"]}</span>', unsafe_allow_html=True)
-                        
-                        # Additional tags from your data
-                        for tag_col in ['Effort Estimate', 'Weather Badge']:
-                            if tag_col in event and event[tag_col] and str(event[tag_col]) != 'nan':
-                                st.markdown(f'<span class="tag">{event[tag_col]}</span>', unsafe_allow_html=True)
-                        
-                        st.markdown("**📝 Description:**")
-                        st.markdown(event.get('short_description', event.get('description', '')[:150] + "..."))
+                        # Event card - header, tags, description and rating in one markdown block
+                        card_html = (
+                            f'{header}{event["_tags_html"]}'
+                            f'<p><strong>📝 Description:</strong></p><p>{description_snippet(event["description"])}</p>'
+                        )
                         
                         # Community rating
-                        avg_rating = get_event_rating(event['event_id'])
-                        if avg_rating:
-                            stars = "⭐" * int(avg_rating)
-                            st.markdown(f'<div class="rating-display">{stars} Rating: {avg_rating}/5</div>', unsafe_allow_html=True)
+                        if event['event_id'] in event_ratings:
+                            avg_rating, stars = event_ratings[event['event_id']]
+                            card_html += f'<div class="rating-display">{stars} Rating: {avg_rating}/5</div>'
+                        
+                        st.markdown(card_html, unsafe_allow_html=True)
                     
                     with col2:
                         # Main buttons
                         if st.button(f"I'm Interested!", key=f"interest_{idx}"):
                             st.success("🎉 Great! We'll use this to improve your recommendations!")
                             # Add to user preferences
-                            if event['Topical Theme'] and event['Topical Theme'] not in st.session_state.user_preferences['themes']:
-                                st.session_state.user_preferences['themes'].append(event['Topical Theme'])
-                            if event['Mood/Intent'] and event['Mood/Intent'] not in st.session_state.user_preferences['moods']:
-                                st.session_state.user_preferences['moods'].append(event['Mood/Intent'])
+                            if event['Topical Theme']:
+                                st.session_state.user_preferences['themes'].add(event['Topical Theme'])
+                            if event['Mood/Intent']:
+                                st.session_state.user_preferences['moods'].add(event['Mood/Intent'])
                         
                         # COSINE SIMILARITY RECOMMENDATION BUTTON
                         if st.button(f"🎯 Find Similar Events", key=f"similar_{idx}"):
-                            # Get the actual index in the original dataframe
-                            original_index = results.index[idx]
-                            # Convert to position in the dataframe for similarity matrix
-                            event_position = df.index.get_loc(original_index)
+                            # Position in the dataframe is the row of the similarity matrix
                             st.session_state.show_recommendations = True
-                            st.session_state.recommended_for_event = event_position
+                            st.session_state.recommended_for_event = int(match_positions[idx])
                             st.rerun()
                         
-                        # Rating system
-                        rating = st.slider("Rate:", 1, 5, 3, key=f"rating_{idx}")
-                        if st.button(f"Submit Rating", key=f"submit_{idx}"):
-                            store_feedback(event['event_id'], rating, "")
-                            st.success("✅ Thanks!")
+                        # Rating system - a form, so moving the slider doesn't rerun the app until submitted
+                        with st.form(key=f"rating_form_{idx}", border=False):
+                            rating = st.slider("Rate:", 1, 5, 3, key=f"rating_{idx}")
+                            if st.form_submit_button("Submit Rating"):
+                                store_feedback(event['event_id'], rating, "")
+                                st.success("✅ Thanks!")
+                
+                if not more_results.empty:
+                    st.markdown("#### More matches")
+                    st.dataframe(
+                        more_results[['title', 'org_title', 'location_display', 'Topical Theme']],
+                        column_config={
+                            'title': "Event",
+                            'org_title': "Organization",
+                            'location_display': "Location",
+                            'Topical Theme': "Theme",
+                        },
+                        hide_index=True,
+                    )
                 
                 # Show recommendations if requested
                 if st.session_state.show_recommendations and st.session_state.recommended_for_event is not None:
@@ -753,32 +550,23 @@ with tab1:
                     
                     similar_events = get_event_recommendations(
                         st.session_state.recommended_for_event, 
-                        similarity_matrix, 
+                        tfidf_matrix, 
                         df, 
                         num_recommendations=5
                     )
                     
                     if not similar_events.empty:
-                        for idx, (_, event) in enumerate(similar_events.iterrows()):
-                            similarity_score = event['similarity_score']
-                            
-                            st.markdown(f"""
-                            <div class="recommendation-card">
-                                <div class="event-title">⭐ {event['title']}</div>
-                                <div class="event-org">🏢 {event['org_title']}</div>
-                                <div class="event-location">📍 {event['location_display']}</div>
-                            </div>
-                            """, unsafe_allow_html=True)
-                            
+                        headers = card_headers(similar_events, "recommendation-card", "⭐")
+                        for idx, (event, header) in enumerate(zip(similar_events.to_dict('records'), headers)):
                             col1, col2 = st.columns([3, 1])
                             
                             with col1:
-                                st.markdown(f'<div class="similarity-score">🎯 {similarity_score:.3f} similarity match</div>', unsafe_allow_html=True)
-                                
-                                if 'Topical Theme' in event and event['Topical Theme'] and str(event['Topical Theme']) != 'nan':
-                                    st.markdown(f'<span class="tag">🎯 {event["Topical Theme"]}</span>', unsafe_allow_html=True)
-                                
-                                st.markdown(event.get('short_description', event.get('description', '')[:150] + "..."))
+                                theme_tag = f'<span class="tag">🎯 {event["Topical Theme"]}</span>' if event['Topical Theme'] else ''
+                                st.markdown(
+                                    f'{header}<div class="similarity-score">🎯 {event["similarity_score"]:.3f} similarity match</div>'
+                                    f'{theme_tag}<p>{description_snippet(event["description"])}</p>',
+                                    unsafe_allow_html=True
+                                )
                             
                             with col2:
                                 if st.button(f"I'm Interested!", key=f"rec_interest_{idx}"):
@@ -800,59 +588,23 @@ with tab2:
     
     with col1:
         st.markdown("**Select your interests:**")
-        available_themes = [theme for theme in df['Topical Theme'].dropna().unique() if theme and str(theme) != 'nan']
         selected_themes = st.multiselect("Choose themes that interest you:", available_themes)
     
     with col2:
         st.markdown("**How do you like to help?**")
-        available_moods = [mood for mood in df['Mood/Intent'].dropna().unique() if mood and str(mood) != 'nan']
         selected_moods = st.multiselect("Choose your preferred volunteer style:", available_moods)
     
     if st.button("🚀 Get My Recommendations", type="primary"):
         if selected_themes or selected_moods:
             recommendations = get_recommendations_by_preferences(
-                selected_themes, selected_moods, df, tfidf_vectorizer, num_recommendations=6
+                selected_themes, selected_moods, df, tfidf_vectorizer, tfidf_matrix, num_recommendations=6
             )
             
             st.markdown("### 🌟 Your Personalized Recommendations")
             
-            for idx, (_, event) in enumerate(recommendations.iterrows()):
-                similarity_score = event['similarity_score']
-                
-                st.markdown(f"""
-                <div class="recommendation-card">
-                    <div class="event-title">⭐ {event['title']}</div>
-                    <div class="event-org">🏢 {event['org_title']}</div>
-                    <div class="event-location">📍 {event['location_display']}</div>
-                </div>
-                """, unsafe_allow_html=True)
-                
-                col1, col2 = st.columns([3, 1])
-                
-                with col1:
-                    st.markdown(f'<div class="similarity-score">🎯 {similarity_score:.3f} match score</div>', unsafe_allow_html=True)
-                    
-                    if 'Topical Theme' in event and event['Topical Theme'] and str(event['Topical Theme']) != 'nan':
-                        st.markdown(f'<span class="tag">🎯 {event["Topical Theme"]}</span>', unsafe_allow_html=True)
-                    
-                    if 'Mood/Intent' in event and event['Mood/Intent'] and str(event['Mood/Intent']) != 'nan':
-                        st.markdown(f'<span class="tag">💭 {event["Mood/Intent"]}</span>', unsafe_allow_html=True)
-                    
-                    # Additional tags from your data
-                    for tag_col in ['Effort Estimate', 'Weather Badge']:
-                        if tag_col in event and event[tag_col] and str(event[tag_col]) != 'nan':
-                            st.markdown(f'<span class="tag">{event[tag_col]}</span>', unsafe_allow_html=True)
-                    
-                    st.markdown(event.get('short_description', event.get('description', '')[:150] + "..."))
-                
-                with col2:
-                    if st.button(f"I'm Interested!", key=f"pref_interest_{idx}"):
-                        st.success("🎉 Great choice!")
-                        # Add to user preferences
-                        if event['Topical Theme'] and event['Topical Theme'] not in st.session_state.user_preferences['themes']:
-                            st.session_state.user_preferences['themes'].append(event['Topical Theme'])
-                        if event['Mood/Intent'] and event['Mood/Intent'] not in st.session_state.user_preferences['moods']:
-                            st.session_state.user_preferences['moods'].append(event['Mood/Intent'])
+            headers = card_headers(recommendations, "recommendation-card", "⭐")
+            for idx, (event, header) in enumerate(zip(recommendations.to_dict('records'), headers)):
+                recommendation_card(event, header, key=f"pref_interest_{idx}")
         else:
             st.warning("Please select at least one theme or mood to get recommendations!")
 
@@ -864,12 +616,12 @@ with tab3:
         
         with col1:
             st.markdown("**Your preferred themes:**")
-            for theme in st.session_state.user_preferences['themes']:
+            for theme in sorted(st.session_state.user_preferences['themes']):
                 st.markdown(f"• {theme}")
         
         with col2:
             st.markdown("**Your preferred volunteer styles:**")
-            for mood in st.session_state.user_preferences['moods']:
+            for mood in sorted(st.session_state.user_preferences['moods']):
                 st.markdown(f"• {mood}")
         
         st.markdown("---")
@@ -878,44 +630,20 @@ with tab3:
         if st.button("🎯 Get Recommendations Based On My Interests", type="primary"):
             if st.session_state.user_preferences['themes'] or st.session_state.user_preferences['moods']:
                 recommendations = get_recommendations_by_preferences(
-                    st.session_state.user_preferences['themes'], 
-                    st.session_state.user_preferences['moods'], 
-                    df, tfidf_vectorizer, 
+                    sorted(st.session_state.user_preferences['themes']), 
+                    sorted(st.session_state.user_preferences['moods']), 
+                    df, tfidf_vectorizer, tfidf_matrix,
                     num_recommendations=8
                 )
                 
                 st.markdown("### 🌟 Recommendations Based On Your Saved Interests")
                 
-                for idx, (_, event) in enumerate(recommendations.iterrows()):
-                    similarity_score = event['similarity_score']
-                    
-                    st.markdown(f"""
-                    <div class="recommendation-card">
-                        <div class="event-title">⭐ {event['title']}</div>
-                        <div class="event-org">🏢 {event['org_title']}</div>
-                        <div class="event-location">📍 {event['location_display']}</div>
-                    </div>
-                    """, unsafe_allow_html=True)
-                    
-                    col1, col2 = st.columns([3, 1])
-                    
-                    with col1:
-                        st.markdown(f'<div class="similarity-score">🎯 {similarity_score:.3f} match score</div>', unsafe_allow_html=True)
-                        
-                        if 'Topical Theme' in event and event['Topical Theme'] and str(event['Topical Theme']) != 'nan':
-                            st.markdown(f'<span class="tag">🎯 {event["Topical Theme"]}</span>', unsafe_allow_html=True)
-                        
-                        if 'Mood/Intent' in event and event['Mood/Intent'] and str(event['Mood/Intent']) != 'nan':
-                            st.markdown(f'<span class="tag">💭 {event["Mood/Intent"]}</span>', unsafe_allow_html=True)
-                        
-                        st.markdown(event.get('short_description', event.get('description', '')[:150] + "..."))
-                    
-                    with col2:
-                        if st.button(f"I'm Interested!", key=f"saved_interest_{idx}"):
-                            st.success("🎉 Great choice!")
+                headers = card_headers(recommendations, "recommendation-card", "⭐")
+                for idx, (event, header) in enumerate(zip(recommendations.to_dict('records'), headers)):
+                    recommendation_card(event, header, key=f"saved_interest_{idx}")
         
         if st.button("🔄 Clear My Preferences"):
-            st.session_state.user_preferences = {'themes': [], 'moods': []}
+            st.session_state.user_preferences = {'themes': set(), 'moods': set()}
             st.success("Preferences cleared!")
             st.rerun()
     else:
@@ -925,14 +653,14 @@ with tab3:
         st.markdown("### 🚀 Get Started - Popular Categories:")
         
         if 'Topical Theme' in df.columns:
-            popular_themes = df['Topical Theme'].value_counts().head(6).index.tolist()
+            popular_themes = sidebar_stats['top_themes'].index.tolist()
             cols = st.columns(3)
             
             for i, theme in enumerate(popular_themes):
                 if theme and str(theme) != 'nan':
                     with cols[i % 3]:
                         if st.button(f"Explore {theme}", key=f"explore_{i}"):
-                            st.session_state.user_preferences['themes'].append(theme)
+                            st.session_state.user_preferences['themes'].add(theme)
                             st.success(f"Added {theme} to your interests!")
                             st.rerun()
 
@@ -944,15 +672,13 @@ with st.sidebar:
     st.metric("Total Opportunities", total_events)
     
     # Show unique themes and moods
-    unique_themes = len([theme for theme in df['Topical Theme'].dropna().unique() if theme and str(theme) != 'nan'])
-    st.metric("Unique Themes", unique_themes)
+    st.metric("Unique Themes", len(available_themes))
     
-    unique_moods = len([mood for mood in df['Mood/Intent'].dropna().unique() if mood and str(mood) != 'nan'])
-    st.metric("Volunteer Styles", unique_moods)
+    st.metric("Volunteer Styles", len(available_moods))
     
-    # Show similarity matrix info
-    if similarity_matrix is not None:
-        st.metric("AI Similarity Matrix", f"{similarity_matrix.shape[0]}×{similarity_matrix.shape[1]}")
+    # Show TF-IDF matrix info (events × vocabulary terms) - similarities are computed from it on demand
+    if tfidf_matrix is not None:
+        st.metric("AI TF-IDF Matrix", f"{tfidf_matrix.shape[0]}×{tfidf_matrix.shape[1]}")
     
     # Show user's current interests
     total_interests = len(st.session_state.user_preferences['themes']) + len(st.session_state.user_preferences['moods'])
@@ -975,7 +701,7 @@ with st.sidebar:
     st.header("📈 Your Data")
     
     if 'Topical Theme' in df.columns:
-        top_themes = df['Topical Theme'].value_counts().head(5)
+        top_themes = sidebar_stats['top_themes'].head(5)
         st.markdown("**Most Popular Themes:**")
         for theme, count in top_themes.items():
             if theme and str(theme) != 'nan':